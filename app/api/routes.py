@@ -1,6 +1,6 @@
 # app/api/routes.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from typing import Optional
 
 from app.schemas.chat import (
@@ -44,10 +44,10 @@ async def health_check():
 # ═══════════════════════════════════════════════════════════════
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """Endpoint principal del chat con el agente IA"""
+async def chat(request: ChatRequest, x_request_timeout: Optional[float] = Header(None)):
+    """Endpoint principal del chat con el agente IA (deadline opcional en segundos vía X-Request-Timeout)"""
     try:
-        response = await chat_service.process_chat(request)
+        response = await chat_service.process_chat(request, timeout=x_request_timeout)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     ODOO_DB: str = "produccion"
     ODOO_USER: str = "admin"
     ODOO_PASSWORD: str
+    ODOO_TIMEOUT: float = 15.0  # Timeout de socket para cada llamada XML-RPC
+    ODOO_MAX_WORKERS: int = 8  # Hilos dedicados a Odoo, separados del executor por defecto
     
     # Supabase
     SUPABASE_URL: str
@@ -28,6 +30,16 @@ class Settings(BaseSettings):
     
     # Groq
     GROQ_API_KEY: str
+    
+    # Deadline del chat (segundos). Se puede ajustar por request con el header X-Request-Timeout
+    CHAT_DEADLINE_SECONDS: float = 30.0
+    CHAT_DEADLINE_MAX_SECONDS: float = 120.0
+    # Cuotas del deadline por etapa; el LLM recibe lo que queda tras Odoo, menos la reserva de persistencia
+    CHAT_ODOO_BUDGET_SHARE: float = 0.3
+    CHAT_PERSISTENCE_BUDGET_SHARE: float = 0.15
+    
+    # Ruteo de intenciones: JSON opcional {intención: {idioma: [términos]}} que extiende los vocabularios
+    INTENT_VOCABULARY_PATH: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,29 @@
+# app/core/deadline.py
+
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+
+class Deadline:
+    """Presupuesto de tiempo de un request, repartido entre las etapas del pipeline"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def for_request(cls, timeout: Optional[float] = None) -> "Deadline":
+        """Crea el deadline a partir del header del cliente o de la configuración"""
+        if timeout and timeout > 0:
+            return cls(min(timeout, settings.CHAT_DEADLINE_MAX_SECONDS))
+        return cls(settings.CHAT_DEADLINE_SECONDS)
+
+    def remaining(self) -> float:
+        """Segundos que quedan antes de vencer el deadline"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def budget(self, share: float = 1.0, reserve: float = 0.0) -> float:
+        """Tiempo para una etapa: su cuota del total, sin invadir la reserva de las etapas siguientes"""
+        return max(0.0, min(self.seconds * share, self.remaining() - self.seconds * reserve))
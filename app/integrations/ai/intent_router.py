@@ -0,0 +1,238 @@
+# app/integrations/ai/intent_router.py
+
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+# Vocabularios por intención y por idioma. Las frases de varias palabras pesan más que
+# las palabras sueltas, así "más vendido" gana a "vendido".
+DEFAULT_VOCABULARIES: Dict[str, Dict[str, List[str]]] = {
+    "ventas": {
+        "es": ["venta", "vendido", "ingreso", "facturación", "facturado"],
+        "en": ["sales", "revenue", "sold", "income"],
+    },
+    "productos": {
+        "es": ["producto", "top", "más vendido", "popular", "populares"],
+        "en": ["product", "best selling", "best seller", "top", "popular"],
+    },
+    "inventario": {
+        "es": ["inventario", "stock", "existencia", "bodega"],
+        "en": ["inventory", "stock", "warehouse"],
+    },
+    "clientes": {
+        "es": ["cliente"],
+        "en": ["customer", "client"],
+    },
+    "ordenes": {
+        "es": ["orden", "pedido", "reciente"],
+        "en": ["order", "recent"],
+    },
+}
+
+DEFAULT_INTENT = "resumen"
+
+_TOKEN_RE = re.compile(r'"([^"]+)"|“([^”]+)”|\w+')
+# Solo dígitos ASCII y acotados: \w también acepta "²" o "①", que int() rechaza
+_NUMBER_RE = re.compile(r"[0-9]{1,6}")
+
+
+def _build_accent_table() -> Dict[int, str]:
+    table = {}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        base = "".join(c for c in unicodedata.normalize("NFD", char) if not unicodedata.combining(c))
+        if len(base) == 1 and base != char:
+            table[code] = base
+    return table
+
+
+_ACCENT_TABLE = _build_accent_table()
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin acentos ("Facturación" -> "facturacion")"""
+    return text.translate(_ACCENT_TABLE).lower()
+
+
+def _stem(token: str) -> str:
+    """Reduce singular y plural a la misma forma ("clientes"/"cliente" -> "client")"""
+    if len(token) > 4 and token.endswith("s"):
+        token = token[:-1]
+    if len(token) > 4 and token.endswith("e") and token[-2] not in "aeiou":
+        token = token[:-1]
+    return token
+
+
+def _terms(text: str) -> List[str]:
+    return [_stem(m.group()) for m in _TOKEN_RE.finditer(normalize(text))]
+
+
+# Parámetros: unidades de tiempo (en días), marcadores de rango y de límite.
+# Se guardan ya normalizados, igual que los tokens del mensaje.
+PERIOD_DAYS = {_stem(unit): days for unit, days in {
+    "hoy": 1, "today": 1,
+    "dia": 1, "dias": 1, "day": 1, "days": 1,
+    "semana": 7, "week": 7,
+    "mes": 30, "meses": 30, "month": 30,
+    "trimestre": 90, "quarter": 90,
+    "ano": 365, "anos": 365, "year": 365,
+}.items()}
+PERIOD_QUALIFIERS = {_stem(w) for w in (
+    "este", "esta", "ultimos", "ultimas", "pasado", "pasada", "la", "el", "del",
+    "this", "last", "past", "the",
+)}
+LIMIT_MARKERS = {_stem(w) for w in ("top", "los", "las", "primeros", "primeras", "mejores", "first", "best")}
+PRODUCT_MARKER_PREFIXES = {"del", "de", "of"}
+PRODUCT_MARKERS = {_stem(w) for w in ("producto", "product", "articulo", "item")}
+# Intención dueña de cada parámetro: decide los empates ("stock del producto X" -> inventario)
+PARAM_OWNERS = {"product_name": "inventario"}
+# En empate, la intención más específica gana: "ventas por producto" es un ranking de productos
+SPECIFIC_OVER = {"productos": {"ventas"}}
+NAME_STOPWORDS = {_stem(w) for w in ("en", "con", "para", "y", "durante", "desde", "in", "with", "for", "and", "during", "since")}
+
+
+def _starts_period(tokens: List[str], i: int) -> bool:
+    """"hoy", "semana pasada" o "esta semana" empiezan en la posición i"""
+    if tokens[i] in ("hoy", "today"):
+        return True
+    if tokens[i] in PERIOD_DAYS:
+        return i + 1 < len(tokens) and tokens[i + 1] in PERIOD_QUALIFIERS
+    return tokens[i] in PERIOD_QUALIFIERS and i + 1 < len(tokens) and tokens[i + 1] in PERIOD_DAYS
+
+
+@dataclass
+class IntentMatch:
+    """Intención detectada con su puntaje y los términos que la activaron"""
+    name: str
+    score: float
+    terms: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RouteResult:
+    """Resultado del ruteo: intenciones ordenadas por puntaje y parámetros extraídos"""
+    intents: List[IntentMatch]
+    params: Dict[str, Any]
+
+    @property
+    def primary(self) -> str:
+        return self.intents[0].name if self.intents else DEFAULT_INTENT
+
+
+class IntentRouter:
+    """Compila los vocabularios en un trie de términos y rutea cada mensaje en una sola pasada"""
+
+    _END = ""
+
+    def __init__(self, vocabularies: Dict[str, Dict[str, List[str]]]):
+        self._order = {intent: i for i, intent in enumerate(vocabularies)}
+        self._trie: Dict[str, Any] = {}
+        for intent, languages in vocabularies.items():
+            for terms in languages.values():
+                for term in terms:
+                    self._add(intent, term)
+
+    def _add(self, intent: str, term: str):
+        tokens = _terms(term)
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        entries = node.setdefault(self._END, [])
+        if all(name != intent for name, _ in entries):
+            entries.append((intent, float(len(tokens))))
+
+    def route(self, message: str) -> RouteResult:
+        normalized = normalize(message)
+        # Los nombres se recortan del texto original si la normalización conservó las posiciones
+        source = message if len(message) == len(normalized) else normalized
+        matches = list(_TOKEN_RE.finditer(normalized))
+        tokens = [_stem(m.group()) for m in matches]
+
+        scores: Dict[str, IntentMatch] = {}
+        params: Dict[str, Any] = {}
+        i, n = 0, len(tokens)
+        while i < n:
+            token = tokens[i]
+            match = matches[i]
+
+            # Texto entre comillas: nombre de producto explícito
+            if match.group(1) or match.group(2):
+                params["product_name"] = source[match.start() + 1:match.end() - 1].strip()
+                i += 1
+                continue
+
+            # Parámetros numéricos: "últimos 7 días", "top 5", "los 10 clientes"
+            if _NUMBER_RE.fullmatch(token):
+                value = int(token)
+                unit = tokens[i + 1] if i + 1 < n else ""
+                if unit in PERIOD_DAYS:
+                    params["days"] = value * PERIOD_DAYS[unit]
+                elif (i > 0 and tokens[i - 1] in LIMIT_MARKERS) or unit in self._trie:
+                    params["limit"] = value
+            # Periodos: "este mes", "la semana pasada", "hoy"
+            elif token in PERIOD_DAYS and "days" not in params and (
+                token in ("hoy", "today")
+                or (i > 0 and tokens[i - 1] in PERIOD_QUALIFIERS)
+                or (i + 1 < n and tokens[i + 1] in PERIOD_QUALIFIERS)
+            ):
+                params["days"] = PERIOD_DAYS[token]
+            # Nombre de producto: "stock del producto Silla Gamer"
+            elif token in PRODUCT_MARKERS and i > 0 and tokens[i - 1] in PRODUCT_MARKER_PREFIXES:
+                end = i + 1
+                while end < n and tokens[end] not in NAME_STOPWORDS and tokens[end] not in self._trie \
+                        and not _NUMBER_RE.fullmatch(tokens[end]) and not matches[end].group(1) and not matches[end].group(2) \
+                        and not _starts_period(tokens, end):
+                    end += 1
+                if end > i + 1 and "product_name" not in params:
+                    params["product_name"] = source[matches[i + 1].start():matches[end - 1].end()]
+                # El marcador solo introduce un nombre: no cuenta para la intención "productos"
+                if end > i + 1 or (end < n and (matches[end].group(1) or matches[end].group(2))):
+                    i += 1
+                    continue
+
+            # Intenciones: coincidencia más larga en el trie a partir de este token
+            node, j, found, found_end = self._trie, i, None, i
+            while j < n and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if self._END in node:
+                    found, found_end = node[self._END], j
+            if found:
+                term = " ".join(tokens[i:found_end])
+                for intent, weight in found:
+                    entry = scores.setdefault(intent, IntentMatch(intent, 0.0))
+                    entry.score += weight
+                    entry.terms.append(term)
+                i = found_end
+            else:
+                i += 1
+
+        owners = {PARAM_OWNERS[p] for p in params if p in PARAM_OWNERS}
+        shadowed = {general for specific, generals in SPECIFIC_OVER.items() if specific in scores
+                    for general in generals}
+        intents = sorted(scores.values(), key=lambda m: (
+            -m.score, m.name not in owners, m.name in shadowed, self._order[m.name]
+        ))
+        return RouteResult(intents=intents, params=params)
+
+
+def load_vocabularies(path: Optional[str] = None) -> Dict[str, Dict[str, List[str]]]:
+    """Vocabularios por defecto, extendidos con un JSON {intención: {idioma: [términos]}}"""
+    vocabularies = {intent: {lang: list(terms) for lang, terms in langs.items()}
+                    for intent, langs in DEFAULT_VOCABULARIES.items()}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+        for intent, langs in extra.items():
+            for lang, terms in langs.items():
+                vocabularies.setdefault(intent, {}).setdefault(lang, []).extend(terms)
+    return vocabularies
+
+
+intent_router = IntentRouter(load_vocabularies(settings.INTENT_VOCABULARY_PATH))
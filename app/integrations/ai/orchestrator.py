@@ -3,10 +3,27 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from app.core.config import settings
+from app.core.deadline import Deadline
+from app.integrations.ai.intent_router import RouteResult, intent_router
 from app.integrations.odoo.connector import odoo_connector
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
+import asyncio
 import json
 
+MAX_LIMIT = 50
+MAX_DAYS = 365 * 5
+
+DEFAULT_SUGGESTIONS = ["¿Cómo van las ventas?", "Muéstrame el inventario", "¿Cuáles son los productos más vendidos?"]
+SUGGESTIONS = {
+    "ventas": ["¿Cuáles son los productos más vendidos?", "Muéstrame el inventario", "¿Quiénes son mis clientes?"],
+    "productos": ["¿Cómo van las ventas?", "Ver órdenes recientes", "Mostrar clientes"],
+    "inventario": ["¿Cómo van las ventas?", "Ver órdenes recientes", "Mostrar clientes"],
+}
+
+def _days_label(days: int) -> str:
+    return "último día" if days == 1 else f"{days} días"
+
 class AIOrchestrator:
     def __init__(self):
         self.llm = ChatGroq(
@@ -15,6 +32,7 @@ class AIOrchestrator:
             temperature=0.3,
             max_tokens=4096
         )
+        self._odoo_executor = ThreadPoolExecutor(max_workers=settings.ODOO_MAX_WORKERS, thread_name_prefix="odoo")
         
         self.system_prompt = """Eres ARIA (Asistente de Reportes e Inteligencia Artificial), un asistente de negocios.
 Tu trabajo es ayudar con consultas del sistema ERP Odoo.
@@ -36,9 +54,14 @@ DATOS DEL SISTEMA:
 {context}
 """
 
-    async def process_message(self, message: str) -> Dict:
-        context, data, viz_type = await self._analyze_and_fetch(message)
-        response_text = await self._generate_response(message, context)
+    async def process_message(self, message: str, deadline: Optional[Deadline] = None) -> Dict:
+        deadline = deadline or Deadline.for_request()
+        route = intent_router.route(message)
+        context, data, viz_type = await self._analyze_and_fetch(route, deadline)
+        response_text = await self._generate_response(message, context, deadline)
+        partial = response_text is None
+        if partial:
+            response_text = self._summarize_data(data)
         
         chart_data = None
         table_data = None
@@ -62,60 +85,120 @@ DATOS DEL SISTEMA:
                         "title": "Órdenes Recientes"
                     }
         
-        suggestions = self._generate_suggestions(message)
-        return {"message": response_text, "chart": chart_data, "table": table_data, "suggestions": suggestions}
+        suggestions = self._generate_suggestions(route)
+        return {"message": response_text, "chart": chart_data, "table": table_data, "suggestions": suggestions, "partial": partial}
+
+    async def _analyze_and_fetch(self, route: RouteResult, deadline: Deadline) -> tuple:
+        # XML-RPC es bloqueante: corre en un pool propio y cada socket hereda el presupuesto
+        # restante, así un Odoo colgado no deja hilos vivos más allá del deadline
+        budget = deadline.budget(settings.CHAT_ODOO_BUDGET_SHARE)
+
+        def fetch():
+            with odoo_connector.time_budget(budget):
+                return self._fetch(route)
 
-    async def _analyze_and_fetch(self, message: str) -> tuple:
-        message_lower = message.lower()
-        context, data, viz_type = "", None, None
-        
         try:
-            if any(w in message_lower for w in ['venta', 'ventas', 'vendido', 'ingreso']):
-                data = odoo_connector.get_sales_summary(30)
-                context = f"VENTAS (30 días): Total ${data['total']:,.2f}, {data['cantidad_ordenes']} órdenes, promedio ${data['promedio_orden']:,.2f}"
-                viz_type = "line_chart"
-            elif any(w in message_lower for w in ['producto', 'top', 'más vendido', 'popular']):
-                data = odoo_connector.get_top_products(10)
-                context = f"PRODUCTOS MÁS VENDIDOS: {json.dumps(data['productos'], ensure_ascii=False)}"
-                viz_type = "bar_chart"
-            elif any(w in message_lower for w in ['inventario', 'stock', 'existencia']):
-                data = odoo_connector.get_inventory()
-                context = f"INVENTARIO: {data['total_productos']} productos, valor ${data['valor_inventario']:,.2f}, {len(data['productos_bajo_stock'])} bajo stock"
-                viz_type = "bar_chart"
-            elif any(w in message_lower for w in ['cliente', 'clientes']):
-                data = odoo_connector.get_customers(20)
-                context = f"CLIENTES: {data['total']} activos"
-                viz_type = "table"
-            elif any(w in message_lower for w in ['orden', 'pedido', 'reciente']):
-                data = odoo_connector.get_recent_orders(10)
-                context = f"ÓRDENES RECIENTES: {len(data['ordenes'])} órdenes"
-                viz_type = "table"
-            else:
-                data = odoo_connector.get_dashboard_summary()
-                context = f"RESUMEN: Ventas ${data['ventas_30_dias']:,.2f}, {data['ordenes_30_dias']} órdenes, {data['productos_inventario']} productos, {data['total_clientes']} clientes"
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(self._odoo_executor, fetch), timeout=budget)
+        except asyncio.TimeoutError:
+            return "Error: Odoo no respondió a tiempo", None, None
         except Exception as e:
-            context = f"Error: {str(e)}"
+            return f"Error: {str(e)}", None, None
+
+    def _fetch(self, route: RouteResult) -> tuple:
+        intent, params = route.primary, route.params
+        limit = min(params["limit"], MAX_LIMIT) if params.get("limit") else None
+        days = min(max(params.get("days", 30), 1), MAX_DAYS)
+        product_name = params.get("product_name")
+        
+        if intent in ("ventas", "productos") and product_name:
+            data = odoo_connector.get_product_sales(product_name, days)
+            context = f"VENTAS DEL PRODUCTO '{product_name}' ({_days_label(days)}): Total ${data['total']:,.2f}, {data['cantidad']:,.0f} unidades, {data['cantidad_ordenes']} órdenes"
+            viz_type = "line_chart"
+        elif intent == "ventas":
+            data = odoo_connector.get_sales_summary(days)
+            context = f"VENTAS ({_days_label(days)}): Total ${data['total']:,.2f}, {data['cantidad_ordenes']} órdenes, promedio ${data['promedio_orden']:,.2f}"
+            viz_type = "line_chart"
+        elif intent == "productos":
+            data = odoo_connector.get_top_products(limit or 10)
+            context = f"PRODUCTOS MÁS VENDIDOS: {json.dumps(data['productos'], ensure_ascii=False)}"
+            viz_type = "bar_chart"
+        elif intent == "inventario":
+            data = odoo_connector.get_inventory(product_name)
+            context = f"INVENTARIO{f' ({product_name})' if product_name else ''}: {data['total_productos']} productos, valor ${data['valor_inventario']:,.2f}, {len(data['productos_bajo_stock'])} bajo stock"
+            viz_type = "bar_chart"
+        elif intent == "clientes":
+            data = odoo_connector.get_customers(limit or 20)
+            context = f"CLIENTES: {data['total']} activos"
+            viz_type = "table"
+        elif intent == "ordenes":
+            data = odoo_connector.get_recent_orders(limit or 10)
+            context = f"ÓRDENES RECIENTES: {len(data['ordenes'])} órdenes"
+            viz_type = "table"
+        else:
+            data = odoo_connector.get_dashboard_summary()
+            context = f"RESUMEN: Ventas ${data['ventas_30_dias']:,.2f}, {data['ordenes_30_dias']} órdenes, {data['productos_inventario']} productos, {data['total_clientes']} clientes"
+            viz_type = None
+        
+        if product_name and intent not in ("ventas", "productos", "inventario"):
+            # Que el LLM no atribuya al producto datos que no están filtrados por él
+            context += f"\nNOTA: estos datos no están filtrados por el producto '{product_name}'"
         
         return context, data, viz_type
 
-    async def _generate_response(self, message: str, context: str) -> str:
+    async def _generate_response(self, message: str, context: str, deadline: Deadline) -> Optional[str]:
+        """Genera la respuesta con el LLM; retorna None si no termina dentro del presupuesto"""
+        budget = deadline.budget(reserve=settings.CHAT_PERSISTENCE_BUDGET_SHARE)
+        if budget <= 0:
+            return None
         try:
             messages = [
                 SystemMessage(content=self.system_prompt.format(context=context)),
                 HumanMessage(content=message)
             ]
-            response = await self.llm.ainvoke(messages)
+            response = await asyncio.wait_for(self.llm.ainvoke(messages), timeout=budget)
             return response.content
+        except asyncio.TimeoutError:
+            return None
         except Exception as e:
             return f"Error al generar respuesta: {str(e)}"
 
-    def _generate_suggestions(self, message: str) -> List[str]:
-        message_lower = message.lower()
-        if any(w in message_lower for w in ['venta']):
-            return ["¿Cuáles son los productos más vendidos?", "Muéstrame el inventario", "¿Quiénes son mis clientes?"]
-        elif any(w in message_lower for w in ['producto', 'inventario']):
-            return ["¿Cómo van las ventas?", "Ver órdenes recientes", "Mostrar clientes"]
-        else:
-            return ["¿Cómo van las ventas?", "Muéstrame el inventario", "¿Cuáles son los productos más vendidos?"]
+    def _summarize_data(self, data: Optional[Dict]) -> str:
+        """Respuesta degradada a partir de plantillas, cuando el LLM no responde a tiempo"""
+        intro = "⏱️ El análisis detallado está tardando más de lo esperado. Este es un resumen de los datos:\n\n"
+        data = data or {}
+        if "ventas_30_dias" in data:
+            return intro + (
+                f"- Ventas (30 días): **${data['ventas_30_dias']:,.2f}**\n"
+                f"- Órdenes (30 días): **{data['ordenes_30_dias']}**\n"
+                f"- Productos en inventario: **{data['productos_inventario']}**\n"
+                f"- Clientes: **{data['total_clientes']}**"
+            )
+        if "cantidad_ordenes" in data:
+            return intro + (
+                (f"- Producto: **{data['producto']}**\n" if data.get("producto") else "") +
+                f"- Ventas ({_days_label(data.get('dias', 30))}): **${data['total']:,.2f}**\n"
+                f"- Órdenes: **{data['cantidad_ordenes']}**\n"
+                f"- Promedio por orden: **${data['promedio_orden']:,.2f}**"
+            )
+        if "valor_inventario" in data:
+            return intro + (
+                f"- Productos: **{data['total_productos']}**\n"
+                f"- Valor del inventario: **${data['valor_inventario']:,.2f}**\n"
+                f"- Productos bajo stock: **{len(data['productos_bajo_stock'])}**"
+            )
+        if "productos" in data:
+            return intro + "\n".join(
+                f"{i}. **{p['nombre']}**: {p['cantidad']:,.0f} unidades, ${p['total']:,.2f}"
+                for i, p in enumerate(data['productos'], 1)
+            )
+        if "clientes" in data:
+            return intro + f"- Clientes activos: **{data['total']}**"
+        if "ordenes" in data:
+            return intro + f"- Órdenes recientes: **{len(data['ordenes'])}**"
+        return "⏱️ No fue posible obtener una respuesta a tiempo. Por favor, intenta de nuevo."
+
+    def _generate_suggestions(self, route: RouteResult) -> List[str]:
+        return SUGGESTIONS.get(route.primary, DEFAULT_SUGGESTIONS)
 
 ai_orchestrator = AIOrchestrator()
@@ -1,10 +1,35 @@
 # app/integrations/odoo/connector.py
 
 import xmlrpc.client
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
 import json
+import time
+
+# Instante (time.monotonic) en que vence el presupuesto de las llamadas en curso
+_call_deadline: ContextVar[Optional[float]] = ContextVar("odoo_call_deadline", default=None)
+
+
+class _TimeoutMixin:
+    """Aplica un timeout de socket a las conexiones XML-RPC, que por defecto esperan indefinidamente"""
+    timeout: Optional[float] = None
+
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        conn.timeout = self.timeout
+        return conn
+
+
+class TimeoutTransport(_TimeoutMixin, xmlrpc.client.Transport):
+    pass
+
+
+class SafeTimeoutTransport(_TimeoutMixin, xmlrpc.client.SafeTransport):
+    pass
+
 
 class OdooConnector:
     def __init__(self):
@@ -12,11 +37,35 @@ class OdooConnector:
         self.db = settings.ODOO_DB
         self.username = settings.ODOO_USER
         self.password = settings.ODOO_PASSWORD
+        self.timeout = settings.ODOO_TIMEOUT
         self._uid = None
 
+    @contextmanager
+    def time_budget(self, seconds: float):
+        """Limita todas las llamadas XML-RPC del bloque a `seconds` en total"""
+        token = _call_deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _call_deadline.reset(token)
+
+    def _socket_timeout(self) -> float:
+        expires_at = _call_deadline.get()
+        if expires_at is None:
+            return self.timeout
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Odoo no respondió a tiempo")
+        return min(self.timeout, remaining)
+
+    def _proxy(self, endpoint: str) -> xmlrpc.client.ServerProxy:
+        transport = SafeTimeoutTransport() if self.url.startswith('https') else TimeoutTransport()
+        transport.timeout = self._socket_timeout()
+        return xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/{endpoint}', transport=transport)
+
     def _authenticate(self) -> int:
         if not self._uid:
-            common = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/common')
+            common = self._proxy('common')
             self._uid = common.authenticate(self.db, self.username, self.password, {})
             if not self._uid:
                 raise Exception("Error de autenticación con Odoo")
@@ -24,7 +73,7 @@ class OdooConnector:
 
     def execute(self, model: str, method: str, *args, **kwargs) -> Any:
         uid = self._authenticate()
-        models = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/object')
+        models = self._proxy('object')
         return models.execute_kw(self.db, uid, self.password, model, method, args, kwargs)
 
     def search_read(self, model: str, domain=None, fields=None, limit=None, order=None) -> List[Dict]:
@@ -55,6 +104,7 @@ class OdooConnector:
         total = sum(o['amount_total'] for o in orders)
         
         return {
+            "dias": days,
             "total": round(total, 2),
             "cantidad_ordenes": len(orders),
             "promedio_orden": round(total / len(orders), 2) if orders else 0,
@@ -62,6 +112,37 @@ class OdooConnector:
             "ordenes_recientes": orders[-5:][::-1] if orders else []
         }
 
+    def get_product_sales(self, product_name: str, days: int = 30) -> Dict:
+        date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        lines = self.search_read(
+            'sale.order.line',
+            [('state', 'in', ['sale', 'done']), ('order_id.date_order', '>=', date_from),
+             ('product_id.name', 'ilike', product_name)],
+            fields=['order_id', 'product_uom_qty', 'price_subtotal']
+        )
+        order_ids = list({line['order_id'][0] for line in lines if line['order_id']})
+        orders = self.search_read('sale.order', [('id', 'in', order_ids)], fields=['date_order']) if order_ids else []
+        order_dates = {o['id']: o['date_order'][:10] for o in orders}
+        
+        daily = {}
+        for line in lines:
+            date = order_dates.get(line['order_id'][0]) if line['order_id'] else None
+            if date:
+                daily[date] = daily.get(date, 0) + line['price_subtotal']
+        
+        chart_data = [{"fecha": k, "ventas": round(v, 2)} for k, v in sorted(daily.items())]
+        total = sum(line['price_subtotal'] for line in lines)
+        
+        return {
+            "producto": product_name,
+            "dias": days,
+            "total": round(total, 2),
+            "cantidad": sum(line['product_uom_qty'] for line in lines),
+            "cantidad_ordenes": len(order_ids),
+            "promedio_orden": round(total / len(order_ids), 2) if order_ids else 0,
+            "chart_data": chart_data
+        }
+
     def get_top_products(self, limit: int = 10) -> Dict:
         lines = self.search_read(
             'sale.order.line',
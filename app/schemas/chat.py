@@ -32,6 +32,7 @@ class ChatResponse(BaseModel):
     chart: Optional[ChartData] = Field(None, description="Datos de gráfico si aplica")
     table: Optional[TableData] = Field(None, description="Datos de tabla si aplica")
     suggestions: List[str] = Field(default=[], description="Sugerencias de seguimiento")
+    partial: bool = Field(False, description="True si la respuesta es un resumen degradado por vencer el deadline")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -2,9 +2,11 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import asyncio
 import uuid
 
 from app.core.config import settings
+from app.core.deadline import Deadline
 from app.integrations.ai.orchestrator import ai_orchestrator
 from app.schemas.chat import ChatRequest, ChatResponse, ChartData, TableData
 
@@ -22,30 +24,48 @@ class ChatService:
     def __init__(self):
         self.supabase = supabase
     
-    async def process_chat(self, request: ChatRequest, user_id: Optional[str] = None) -> ChatResponse:
-        """Procesa un mensaje de chat y retorna la respuesta"""
+    async def process_chat(
+        self, 
+        request: ChatRequest, 
+        user_id: Optional[str] = None, 
+        timeout: Optional[float] = None
+    ) -> ChatResponse:
+        """Procesa un mensaje de chat y retorna la respuesta dentro del deadline del request"""
+        deadline = Deadline.for_request(timeout)
         
-        # Crear o usar conversación existente
-        conversation_id = request.conversation_id
-        if not conversation_id:
-            conversation_id = await self._create_conversation(user_id, request.message[:50])
+        # El ID se fija antes de persistir, así un insert que termine tarde usa el mismo ID
+        conversation_id = request.conversation_id or str(uuid.uuid4())
+        is_new = not request.conversation_id
         
-        # Guardar mensaje del usuario
-        await self._save_message(conversation_id, "user", request.message)
+        # Crear conversación y guardar mensaje del usuario mientras la IA procesa
+        user_turn = asyncio.create_task(self._save_user_turn(conversation_id, is_new, request.message, user_id))
         
-        # Procesar con IA
-        ai_response = await ai_orchestrator.process_message(request.message)
+        try:
+            # Procesar con IA
+            ai_response = await ai_orchestrator.process_message(request.message, deadline)
+        finally:
+            try:
+                await asyncio.wait_for(user_turn, timeout=deadline.remaining())
+            except asyncio.TimeoutError:
+                print("Timeout guardando mensaje del usuario")
         
         # Guardar respuesta del asistente
-        await self._save_message(
-            conversation_id, 
-            "assistant", 
-            ai_response["message"],
-            metadata={
-                "has_chart": ai_response.get("chart") is not None,
-                "has_table": ai_response.get("table") is not None
-            }
-        )
+        try:
+            await asyncio.wait_for(
+                self._save_message(
+                    conversation_id, 
+                    "assistant", 
+                    ai_response["message"],
+                    metadata={
+                        "has_chart": ai_response.get("chart") is not None,
+                        "has_table": ai_response.get("table") is not None,
+                        "partial": ai_response.get("partial", False)
+                    }
+                ),
+                timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            print("Timeout guardando respuesta del asistente")
         
         # Construir respuesta
         chart_data = None
@@ -61,23 +81,26 @@ class ChatService:
             conversation_id=conversation_id,
             chart=chart_data,
             table=table_data,
-            suggestions=ai_response.get("suggestions", [])
+            suggestions=ai_response.get("suggestions", []),
+            partial=ai_response.get("partial", False)
         )
     
-    async def _create_conversation(self, user_id: Optional[str], title: str) -> str:
-        """Crea una nueva conversación"""
+    async def _save_user_turn(self, conversation_id: str, is_new: bool, message: str, user_id: Optional[str]):
+        """Crea la conversación si hace falta y guarda el mensaje del usuario"""
+        if is_new:
+            await self._create_conversation(conversation_id, user_id, message[:50])
+        await self._save_message(conversation_id, "user", message)
+    
+    async def _create_conversation(self, conversation_id: str, user_id: Optional[str], title: str):
+        """Crea una nueva conversación con el ID indicado"""
         try:
             if self.supabase:
-                data = {"title": title}
+                data = {"id": conversation_id, "title": title}
                 if user_id:
                     data["user_id"] = user_id
-                result = self.supabase.table("conversations").insert(data).execute()
-                return result.data[0]["id"]
+                await asyncio.to_thread(self.supabase.table("conversations").insert(data).execute)
         except Exception as e:
             print(f"Error creando conversación en Supabase: {e}")
-        
-        # Fallback: generar ID local
-        return str(uuid.uuid4())
     
     async def _save_message(
         self, 
@@ -89,12 +112,12 @@ class ChatService:
         """Guarda un mensaje en la base de datos"""
         try:
             if self.supabase:
-                self.supabase.table("messages").insert({
+                await asyncio.to_thread(self.supabase.table("messages").insert({
                     "conversation_id": conversation_id,
                     "role": role,
                     "content": content,
                     "metadata": metadata or {}
-                }).execute()
+                }).execute)
         except Exception as e:
             print(f"Error guardando mensaje: {e}")
     
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+
+# Settings exige estas variables al importar app.core.config
+for key in ("ODOO_URL", "ODOO_PASSWORD", "SUPABASE_URL", "SUPABASE_KEY", "GROQ_API_KEY"):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,74 @@
+# tests/test_chat_service.py
+
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.integrations.ai.orchestrator import ai_orchestrator
+from app.schemas.chat import ChatRequest
+from app.services.chat_service import ChatService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = ChatService()
+    service.calls = []
+
+    async def process_message(message, deadline):
+        return {"message": "ok", "chart": None, "table": None, "suggestions": [], "partial": False}
+
+    monkeypatch.setattr(ai_orchestrator, "process_message", process_message)
+    return service
+
+
+def slow(service, name, delay):
+    async def persist(*args, **kwargs):
+        service.calls.append((name, args))
+        await asyncio.sleep(delay)
+    return persist
+
+
+def test_new_conversation_id_is_shared_by_every_write(service):
+    service._create_conversation = slow(service, "create", 0)
+    service._save_message = slow(service, "save", 0)
+
+    response = asyncio.run(service.process_chat(ChatRequest(message="hola")))
+
+    uuid.UUID(response.conversation_id)
+    assert [(name, args[0]) for name, args in service.calls] == [
+        ("create", response.conversation_id),
+        ("save", response.conversation_id),
+        ("save", response.conversation_id),
+    ]
+
+
+def test_slow_persistence_is_bounded_by_deadline(service):
+    service._create_conversation = slow(service, "create", 5)
+    service._save_message = slow(service, "save", 5)
+
+    start = time.monotonic()
+    response = asyncio.run(service.process_chat(ChatRequest(message="hola", conversation_id="abc"), timeout=0.3))
+
+    assert time.monotonic() - start < 0.5
+    assert response.conversation_id == "abc"
+    assert response.message == "ok"
+
+
+def test_user_turn_is_awaited_when_ai_fails(service, monkeypatch):
+    service._create_conversation = slow(service, "create", 0)
+    service._save_message = slow(service, "save", 0)
+
+    async def failing(message, deadline):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(ai_orchestrator, "process_message", failing)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await service.process_chat(ChatRequest(message="hola"))
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    assert [name for name, _ in service.calls] == ["create", "save"]
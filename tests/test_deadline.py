@@ -0,0 +1,33 @@
+# tests/test_deadline.py
+
+import pytest
+
+from app.core.config import settings
+from app.core.deadline import Deadline
+
+
+def test_for_request_uses_config_default(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_DEADLINE_SECONDS", 12.0)
+    assert Deadline.for_request().seconds == 12.0
+    assert Deadline.for_request(0).seconds == 12.0
+    assert Deadline.for_request(-5).seconds == 12.0
+
+
+def test_for_request_clamps_header(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_DEADLINE_MAX_SECONDS", 60.0)
+    assert Deadline.for_request(5).seconds == 5
+    assert Deadline.for_request(600).seconds == 60.0
+
+
+def test_budget_share_and_reserve():
+    deadline = Deadline(10)
+    assert deadline.budget(0.3) == pytest.approx(3, abs=0.05)
+    assert deadline.budget(reserve=0.15) == pytest.approx(8.5, abs=0.05)
+    assert deadline.budget(0.3, reserve=0.9) == pytest.approx(1, abs=0.05)
+
+
+def test_budget_never_negative():
+    deadline = Deadline(0)
+    assert deadline.remaining() == 0
+    assert deadline.budget() == 0
+    assert deadline.budget(reserve=0.5) == 0
@@ -0,0 +1,123 @@
+# tests/test_intent_router.py
+
+import pytest
+
+from app.integrations.ai.intent_router import DEFAULT_VOCABULARIES, IntentRouter, load_vocabularies
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(load_vocabularies())
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("¿Cómo van las ventas?", "ventas"),
+    ("¿Cuáles son los productos más vendidos?", "productos"),
+    ("Muéstrame el inventario", "inventario"),
+    ("¿Quiénes son mis clientes?", "clientes"),
+    ("Ver órdenes recientes", "ordenes"),
+    ("hola", "resumen"),
+])
+def test_primary_intent(router, message, intent):
+    assert router.route(message).primary == intent
+
+
+def test_phrase_outweighs_single_word(router):
+    result = router.route("¿Qué es lo más vendido?")
+    assert result.primary == "productos"
+    assert all(m.name != "ventas" for m in result.intents)
+
+
+def test_accents_case_and_plurals(router):
+    assert router.route("FACTURACIÓN").primary == "ventas"
+    assert router.route("facturacion").primary == "ventas"
+    assert router.route("ÓRDENES").primary == "ordenes"
+    assert router.route("existencias").primary == "inventario"
+    assert router.route("cliente").primary == router.route("clientes").primary == "clientes"
+
+
+def test_all_matched_intents_are_scored(router):
+    result = router.route("ventas y clientes recientes")
+    assert {m.name for m in result.intents} == {"ventas", "clientes", "ordenes"}
+
+
+@pytest.mark.parametrize("message", [
+    "stock del producto Silla Gamer",
+    'stock del producto "Silla Gamer"',
+])
+def test_product_name_does_not_shadow_intent(router, message):
+    result = router.route(message)
+    assert result.primary == "inventario"
+    assert result.params["product_name"] == "Silla Gamer"
+    assert all(m.name != "productos" for m in result.intents)
+
+
+def test_param_owner_breaks_ties(router):
+    result = router.route('productos en bodega "Mesa Roble"')
+    assert result.params["product_name"] == "Mesa Roble"
+    assert result.primary == "inventario"
+
+
+def test_product_name_stops_at_keywords_and_stopwords(router):
+    assert router.route("inventario del producto Mesa Roble en bodega").params["product_name"] == "Mesa Roble"
+    assert "product_name" not in router.route("ventas del producto más vendido").params
+
+
+@pytest.mark.parametrize("message, days", [
+    ("ventas de los últimos 7 días", 7),
+    ("ventas de las últimas 2 semanas", 14),
+    ("ventas de este mes", 30),
+    ("ventas de hoy", 1),
+    ("facturación del año pasado", 365),
+    ("sales last 3 months", 90),
+    ("ventas de la semana", 7),
+    ("ventas del mes", 30),
+    ("ventas del año", 365),
+])
+def test_days_extraction(router, message, days):
+    assert router.route(message).params["days"] == days
+
+
+@pytest.mark.parametrize("message, limit", [
+    ("top 5 productos", 5),
+    ("los 10 clientes", 10),
+    ("muéstrame 3 órdenes", 3),
+])
+def test_limit_extraction(router, message, limit):
+    assert router.route(message).params["limit"] == limit
+
+
+@pytest.mark.parametrize("message", ["top ²", "ventas ①", "top " + "9" * 5000])
+def test_non_ascii_and_huge_numbers_are_ignored(router, message):
+    assert "limit" not in router.route(message).params
+
+
+@pytest.mark.parametrize("message", [
+    "¿Cuál es el producto con más ventas?",
+    "ventas por producto",
+    "ventas de cada producto",
+])
+def test_product_breakdown_of_sales_routes_to_productos(router, message):
+    assert router.route(message).primary == "productos"
+
+
+def test_sales_of_named_product_keeps_product_name(router):
+    result = router.route("ventas del producto Silla Gamer")
+    assert result.primary == "ventas"
+    assert result.params["product_name"] == "Silla Gamer"
+
+
+def test_load_vocabularies_extends_defaults(tmp_path):
+    path = tmp_path / "vocab.json"
+    path.write_text('{"clientes": {"es": ["comprador"]}, "proveedores": {"es": ["proveedor"]}}', encoding="utf-8")
+    vocabularies = load_vocabularies(str(path))
+    assert "comprador" in vocabularies["clientes"]["es"]
+    assert "comprador" not in DEFAULT_VOCABULARIES["clientes"]["es"]
+    router = IntentRouter(vocabularies)
+    assert router.route("Compradores").primary == "clientes"
+    assert router.route("proveedores").primary == "proveedores"
+
+
+def test_product_name_stops_at_period(router):
+    result = router.route("ventas del producto Silla Gamer esta semana")
+    assert result.params == {"product_name": "Silla Gamer", "days": 7}
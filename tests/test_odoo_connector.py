@@ -0,0 +1,23 @@
+# tests/test_odoo_connector.py
+
+import pytest
+
+from app.integrations.odoo.connector import odoo_connector
+
+
+def test_socket_timeout_defaults_to_config():
+    assert odoo_connector._socket_timeout() == odoo_connector.timeout
+
+
+def test_socket_timeout_follows_budget():
+    with odoo_connector.time_budget(odoo_connector.timeout + 100):
+        assert odoo_connector._socket_timeout() == odoo_connector.timeout
+    with odoo_connector.time_budget(1.0):
+        assert 0 < odoo_connector._socket_timeout() <= 1.0
+    assert odoo_connector._socket_timeout() == odoo_connector.timeout
+
+
+def test_spent_budget_fails_before_connecting():
+    with odoo_connector.time_budget(0):
+        with pytest.raises(TimeoutError):
+            odoo_connector._proxy('object')
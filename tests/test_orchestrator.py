@@ -0,0 +1,99 @@
+# tests/test_orchestrator.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.deadline import Deadline
+from app.integrations.ai.intent_router import intent_router
+from app.integrations.ai.orchestrator import MAX_DAYS, ai_orchestrator
+from app.integrations.odoo.connector import odoo_connector
+
+
+@pytest.mark.parametrize("message, days", [
+    ("ventas de los últimos 999999 días", MAX_DAYS),
+    ("ventas de los últimos 0 días", 1),
+    ("ventas de los últimos 7 días", 7),
+])
+def test_fetch_clamps_sales_days(monkeypatch, message, days):
+    calls = []
+
+    def get_sales_summary(d):
+        calls.append(d)
+        return {"dias": d, "total": 0, "cantidad_ordenes": 0, "promedio_orden": 0, "chart_data": []}
+
+    monkeypatch.setattr(odoo_connector, "get_sales_summary", get_sales_summary)
+    ai_orchestrator._fetch(intent_router.route(message))
+    assert calls == [days]
+
+
+def test_fetch_sales_of_named_product(monkeypatch):
+    calls = []
+
+    def get_product_sales(name, d):
+        calls.append((name, d))
+        return {"producto": name, "dias": d, "total": 150.0, "cantidad": 3, "cantidad_ordenes": 2,
+                "promedio_orden": 75.0, "chart_data": []}
+
+    monkeypatch.setattr(odoo_connector, "get_product_sales", get_product_sales)
+    context, _, viz_type = ai_orchestrator._fetch(intent_router.route("ventas del producto Silla Gamer esta semana"))
+    assert calls == [("Silla Gamer", 7)]
+    assert "Silla Gamer" in context
+    assert viz_type == "line_chart"
+
+
+def test_fetch_flags_product_name_it_cannot_filter(monkeypatch):
+    monkeypatch.setattr(odoo_connector, "get_customers", lambda limit: {"clientes": [], "total": 0})
+    context, _, _ = ai_orchestrator._fetch(intent_router.route('clientes que compraron "Mesa Roble"'))
+    assert "no están filtrados por el producto 'Mesa Roble'" in context
+
+
+SALES = {"dias": 1, "total": 1234.5, "cantidad_ordenes": 3, "promedio_orden": 411.5,
+         "chart_data": [{"fecha": "2026-10-19", "ventas": 1234.5}]}
+
+
+class SlowLLM:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay)
+        raise AssertionError("el LLM debió cancelarse")
+
+
+def test_llm_overrun_returns_partial_summary(monkeypatch):
+    monkeypatch.setattr(odoo_connector, "get_sales_summary", lambda days: dict(SALES, dias=days))
+    monkeypatch.setattr(ai_orchestrator, "llm", SlowLLM(5))
+
+    start = time.monotonic()
+    response = asyncio.run(ai_orchestrator.process_message("ventas de hoy", Deadline(0.5)))
+
+    assert time.monotonic() - start < 0.5
+    assert response["partial"] is True
+    assert "$1,234.50" in response["message"]
+    assert "Ventas (último día)" in response["message"]
+    assert response["chart"]["data"] == SALES["chart_data"]
+
+
+def test_odoo_overrun_is_abandoned_at_its_budget(monkeypatch):
+    def slow_sales(days):
+        time.sleep(1)
+        return SALES
+
+    monkeypatch.setattr(odoo_connector, "get_sales_summary", slow_sales)
+    deadline = Deadline(1)
+
+    start = time.monotonic()
+    context, data, viz_type = asyncio.run(
+        ai_orchestrator._analyze_and_fetch(intent_router.route("ventas"), deadline)
+    )
+
+    assert time.monotonic() - start < 0.5
+    assert context == "Error: Odoo no respondió a tiempo"
+    assert data is None and viz_type is None
+
+
+def test_summary_days_label():
+    assert "Ventas (último día)" in ai_orchestrator._summarize_data(dict(SALES, dias=1))
+    assert "Ventas (7 días)" in ai_orchestrator._summarize_data(dict(SALES, dias=7))